@@ -0,0 +1,150 @@
+# type: ignore
+import os
+import argparse
+import numpy as np
+import tensorflow as tf
+import tf2onnx
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from tensorflow.keras.models import load_model  # type: ignore
+
+
+# First-layer activations that model.py can apply in NumPy
+SUPPORTED_ACTIVATIONS = ("linear", "relu", "tanh", "sigmoid")
+
+
+def split_first_layer(model, weights_path):
+    """
+    Export the first Dense layer's weights and return a model of the remaining layers.
+
+    The TF-IDF input is almost entirely zeros, so model.py applies the first
+    layer as a sparse matrix product and only runs the rest through ONNX.
+
+    Args:
+        model: Loaded Keras model
+        weights_path (str): Path to write the first layer's weights (.npz)
+
+    Returns:
+        Keras model made of layers[1:], or the original model if it cannot be split
+    """
+    first = model.layers[0]
+    activation = first.get_config().get("activation")
+    if (len(model.layers) < 2 or not isinstance(first, tf.keras.layers.Dense)
+            or activation not in SUPPORTED_ACTIVATIONS):
+        print("First layer cannot be split off; exporting the full model.")
+        # model.py applies any weights file it finds, so don't leave one from an earlier conversion
+        if os.path.exists(weights_path):
+            os.remove(weights_path)
+            print(f"Removed stale first layer weights at {weights_path}")
+        return model
+
+    W, b = first.get_weights()
+    np.savez(weights_path, W0=W.astype(np.float32), b0=b.astype(np.float32), activation=activation)
+    print(f"First layer weights written to {weights_path}")
+
+    return tf.keras.Sequential([tf.keras.Input(shape=(W.shape[1],))] + model.layers[1:])
+
+
+def convert_keras_to_onnx(model_path="model/model3.h5", output_path="model/model.onnx", opset=15,
+                          first_layer_path="model/first_layer.npz"):
+    """
+    Convert the trained Keras model to ONNX for inference with onnxruntime.
+
+    This only needs to run once at build time; model.py loads the resulting
+    .onnx file so TensorFlow is not required at runtime.
+
+    Args:
+        model_path (str): Path to the trained Keras model file (.h5)
+        output_path (str): Path to write the ONNX model to
+        opset (int): ONNX opset version to target
+        first_layer_path (str): Path to write the first Dense layer's weights to,
+            or None to export the full model
+
+    Returns:
+        str: Path to the written ONNX model
+    """
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model file not found: {model_path}")
+
+    print(f"Loading Keras model from {model_path}...")
+    model = load_model(model_path)
+    if first_layer_path:
+        model = split_first_layer(model, first_layer_path)
+
+    # Keep the batch dimension dynamic so any batch size can be fed at runtime
+    input_signature = [tf.TensorSpec((None, model.input_shape[1]), tf.float32, name="input")]
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=opset,
+                               output_path=output_path)
+    print(f"ONNX model written to {output_path}")
+    return output_path
+
+
+def quantize_first_layer(first_layer_path="model/first_layer.npz",
+                         output_path="model/first_layer_int8.npz"):
+    """
+    Quantize the split-off first Dense layer to int8 with one scale per output column.
+
+    W0 (vocabulary x hidden) holds almost all of the model's weights, so this is
+    where int8 saves size and memory traffic. model.py dequantizes only the rows
+    for terms present in a resume.
+
+    Args:
+        first_layer_path (str): Path to the float32 first layer weights (.npz)
+        output_path (str): Path to write the int8 weights to
+
+    Returns:
+        str: Path to the written int8 weights
+    """
+    weights = np.load(first_layer_path)
+    W = weights["W0"].astype(np.float32)
+    scale = np.abs(W).max(axis=0) / 127
+    scale[scale == 0] = 1
+    W_q = np.clip(np.round(W / scale), -127, 127).astype(np.int8)
+    np.savez(output_path, W0=W_q, W0_scale=scale.astype(np.float32), b0=weights["b0"],
+             activation=weights["activation"])
+
+    error = np.abs(W_q * scale - W).max()
+    print(f"Quantized first layer written to {output_path} "
+          f"({W.nbytes / 1e6:.1f} MB -> {W_q.nbytes / 1e6:.1f} MB, max abs error {error:.2e})")
+    return output_path
+
+
+def quantize_onnx_model(model_path="model/model.onnx", output_path="model/model_int8.onnx"):
+    """
+    Apply post-training int8 quantization to the ONNX model's weights.
+
+    Only worthwhile when the first layer was not split off, so its large weight
+    matrix is part of the ONNX model; the small tail layers are faster in float32.
+
+    Args:
+        model_path (str): Path to the float32 ONNX model
+        output_path (str): Path to write the quantized model to
+
+    Returns:
+        str: Path to the written quantized model
+    """
+    quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    print(f"Quantized ONNX model written to {output_path}")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the Keras job model to ONNX.")
+    parser.add_argument("--model", default="model/model3.h5", help="Path to the Keras .h5 model")
+    parser.add_argument("--output", default="model/model.onnx", help="Path for the ONNX output")
+    parser.add_argument("--opset", type=int, default=15, help="ONNX opset version")
+    parser.add_argument("--first-layer", default="model/first_layer.npz",
+                        help="Path for the first Dense layer's weights (empty to export the full model)")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Also write int8 weights; compare accuracy and latency before using them")
+    parser.add_argument("--quantized-first-layer", default="model/first_layer_int8.npz",
+                        help="Path for the int8 first layer weights when the model is split")
+    parser.add_argument("--quantized-output", default="model/model_int8.onnx",
+                        help="Path for the int8 ONNX model when the model is not split")
+    args = parser.parse_args()
+
+    convert_keras_to_onnx(args.model, args.output, args.opset, args.first_layer or None)
+    if args.quantize:
+        if args.first_layer and os.path.exists(args.first_layer):
+            quantize_first_layer(args.first_layer, args.quantized_first_layer)
+        else:
+            quantize_onnx_model(args.output, args.quantized_output)
@@ -1,30 +1,352 @@
 # type: ignore
-from tensorflow.keras.models import load_model  # type: ignore
-
 import os
+import re
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
-import tensorflow as tf
+import scipy.sparse as sp
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-import pandas as pd
 import pdfplumber
 import docx
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 import pickle
 
-# Load environment variables (for API keys)
-load_dotenv()
+# pypdfium2 is much faster than pdfplumber but drops inter-word spaces on some PDFs
+# (e.g. "ITManager" in 10553553.pdf), which changes TF-IDF tokens, so it is opt-in
+USE_PYPDFIUM = os.environ.get("RESUME_PDF_BACKEND", "").lower() == "pypdfium2"
+
+# Serializes all pypdfium2 calls across threads
+_PDFIUM_LOCK = threading.Lock()
+
+# Process pool for long PDFs, created on first use, see _get_pdf_pool()
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+# Activations for the first Dense layer, applied in NumPy after the sparse matmul
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+}
+
+# Maximum number of distinct resumes/job titles kept in the prediction and course caches
+CACHE_SIZE = 1024
+
+# PDFs with more pages than this are parsed by pdfplumber in several processes. Measured on
+# text-dense pages: ~180 ms/page to extract, ~12 ms per chunk sent to a warm worker, and
+# ~150 ms plus module imports to spawn the pool once; below ~6 pages the split can't win that back.
+PARALLEL_PDF_PAGE_THRESHOLD = 6
+
+# Extra processes used for long PDFs (the calling process parses one chunk itself)
+PDF_WORKERS = (os.cpu_count() or 1) // 2
+
+# Gemini model used for course recommendations unless VITE_GEMINI_MODEL is set
+DEFAULT_GEMINI_MODEL = "gemini-2.5-flash"
+
+# Gemini (connect, read) timeouts in seconds for the first attempt and the single retry
+GEMINI_TIMEOUT = (3.05, 10)
+GEMINI_RETRY_TIMEOUT = (3.05, 5)
+
+# Maximum number of concurrent Gemini course lookups (one per resume)
+COURSE_LOOKUP_WORKERS = 8
+
+# Gemini structured-output schema for a single training course
+_COURSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "course_name": {"type": "string"},
+        "provider": {"type": "string"},
+        "description": {"type": "string"},
+        "url": {"type": "string"},
+        "relevance": {"type": "string"}
+    },
+    "required": ["course_name", "provider", "description", "url", "relevance"]
+}
+# Courses for several jobs in one response; Gemini schemas cannot express maps, so use a list
+_JOB_COURSES_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "job_title": {"type": "string"},
+            "courses": {"type": "array", "items": _COURSE_SCHEMA}
+        },
+        "required": ["job_title", "courses"]
+    }
+}
+
+def _top_k_indices(scores, k):
+    """
+    Indices of the k highest scores in each row, highest first.
+    
+    Uses argpartition so only the k selected entries are sorted instead of the whole row.
+    
+    Args:
+        scores (numpy.ndarray): 2-D array of shape (n_samples, n_classes)
+        k (int): Number of indices to return per row
+        
+    Returns:
+        numpy.ndarray: Array of shape (n_samples, k)
+    """
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    idx = np.argpartition(scores, -k, axis=1)[:, -k:]
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+def _extract_pdf_text(file_path):
+    """
+    Extract text from a PDF, skipping pages that have no text layer.
+    
+    Uses pdfplumber by default. With RESUME_PDF_BACKEND=pypdfium2 set, pypdfium2
+    is tried first and pdfplumber is used if it is missing or fails on the file.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        
+    Returns:
+        str: Extracted text from the PDF
+    """
+    if USE_PYPDFIUM and pdfium is not None:
+        try:
+            # PDFium is not thread-safe, so only one thread may use it at a time
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(file_path)
+                try:
+                    pages = []
+                    for page in pdf:
+                        textpage = page.get_textpage()
+                        # PDFium separates lines with \r\n; match pdfplumber's \n
+                        text = textpage.get_text_range().replace("\r\n", "\n")
+                        textpage.close()
+                        page.close()
+                        if text.strip():
+                            pages.append(text)
+                    return "\n".join(pages)
+                finally:
+                    pdf.close()
+        except Exception as e:
+            print(f"pypdfium2 could not read {file_path}, falling back to pdfplumber: {e}")
+    
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        if page_count <= PARALLEL_PDF_PAGE_THRESHOLD or PDF_WORKERS < 1:
+            return _join_page_texts(pdf.pages)
+        
+        # pdfminer is CPU-bound and holds the GIL, so long PDFs are split across processes;
+        # this process parses the first chunk from the document it already has open
+        chunk_size = -(-page_count // (PDF_WORKERS + 1))
+        chunks = [list(range(start + 1, min(start + chunk_size, page_count) + 1))
+                  for start in range(0, page_count, chunk_size)]
+        pool = _get_pdf_pool()
+        try:
+            futures = [pool.submit(_extract_pdf_pages, file_path, chunk) for chunk in chunks[1:]]
+            texts = [_join_page_texts(pdf.pages[:len(chunks[0])])]
+            texts.extend(future.result() for future in futures)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM or a pdfminer crash); replace the pool next time
+            print(f"PDF worker pool failed, extracting {file_path} in-process: {e}")
+            _discard_pdf_pool(pool)
+            texts = [_join_page_texts(pdf.pages)]
+    return "\n".join(text for text in texts if text)
+
+def _get_pdf_pool():
+    """
+    Get the shared process pool for PDF extraction, creating it on first use.
+    
+    Workers are started with "spawn" because the pool is created from
+    multithreaded code, where forking can deadlock the child.
+    
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The shared pool
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=PDF_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _PDF_POOL
+
+def _discard_pdf_pool(pool):
+    """
+    Drop a broken PDF pool so the next long PDF starts a fresh one.
+    
+    Args:
+        pool (concurrent.futures.ProcessPoolExecutor): The pool that failed
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False)
+
+def _join_page_texts(pages):
+    """
+    Join the text of pdfplumber pages, skipping pages with no text.
+    
+    Args:
+        pages (list): pdfplumber pages
+        
+    Returns:
+        str: Extracted text from the pages
+    """
+    texts = []
+    for page in pages:
+        text = page.extract_text()
+        if text and text.strip():
+            texts.append(text)
+    return "\n".join(texts)
+
+def _extract_pdf_pages(file_path, page_numbers=None):
+    """
+    Extract text from some or all pages of a PDF with pdfplumber, skipping empty pages.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        page_numbers (list): 1-based page numbers to read, or None for all pages
+        
+    Returns:
+        str: Extracted text from the pages
+    """
+    with pdfplumber.open(file_path, pages=page_numbers) as pdf:
+        return _join_page_texts(pdf.pages)
+
+def extract_text(file_path):
+    """
+    Extract text from PDF, DOCX or TXT resume files.
+    
+    Results are memoized per (path, modification time, size), so re-reading an
+    unchanged file skips parsing entirely.
+    
+    Args:
+        file_path (str): Path to the resume file
+        
+    Returns:
+        str: Extracted text from the resume
+        
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file format is not supported or the file cannot be parsed
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Resume file not found: {file_path}")
+    return _extract_text_cached(file_path, stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=64)
+def _extract_text_cached(file_path, mtime_ns, size):
+    # mtime_ns and size are only part of the cache key
+    if file_path.lower().endswith(".pdf"):
+        try:
+            return _extract_pdf_text(file_path)
+        except Exception as e:
+            raise ValueError(f"Error extracting text from PDF: {e}")
+    elif file_path.lower().endswith(".docx"):
+        try:
+            doc = docx.Document(file_path)
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+        except Exception as e:
+            raise ValueError(f"Error extracting text from DOCX: {e}")
+    elif file_path.lower().endswith(".txt"):
+        try:
+            with open(file_path, 'r') as f:
+                return f.read()
+        except Exception as e:
+            raise ValueError(f"Error reading text file: {e}")
+    else:
+        raise ValueError("Unsupported file format. Only .pdf, .docx, and .txt are supported.")
+
+def _default_courses(job_title):
+    """
+    Generic course suggestion used when no tailored courses are available.
+    
+    Args:
+        job_title (str): The job title to suggest courses for
+        
+    Returns:
+        list: List with a single generic course
+    """
+    return [
+        {
+            "course_name": f"{job_title} Fundamentals",
+            "provider": "Coursera",
+            "description": f"Comprehensive training for {job_title} roles",
+            "url": "https://www.coursera.org",
+            "relevance": "Core professional skills"
+        }
+    ]
+
+def _hash_resume(resume_text):
+    """
+    Hash resume text for use as a cache key.
+    
+    Args:
+        resume_text (str): Resume text
+        
+    Returns:
+        str: Hex digest identifying the resume text
+    """
+    return hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
+
+def _normalize_title(job_title):
+    """Normalize a job title for matching: collapse whitespace and ignore case."""
+    return " ".join(job_title.split()).casefold()
+
+class _LRUCache:
+    """Small thread-safe least-recently-used mapping for caching results by key."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Store value for key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+class GeminiAPIError(Exception):
+    """Raised when the Gemini API returns a non-200 response."""
 
 class JobRecommendationSystem:
-    def __init__(self, model_path="model/model3.h5", vectorizer_path="vectorizer.pkl", 
-                 job_mapping_path="job_titles.json"):
+    def __init__(self, model_path="model/model.onnx", vectorizer_path="vectorizer.pkl", 
+                 job_mapping_path="job_titles.json", first_layer_path="model/first_layer.npz"):
         """
         Initialize the Job Recommendation System.
         
         Args:
-            model_path (str): Path to the trained model file
+            model_path (str): Path to the ONNX model file (see convert_model.py)
             vectorizer_path (str): Path to the trained TF-IDF vectorizer
             job_mapping_path (str): Path to the job title mapping JSON file
+            first_layer_path (str): Path to the first Dense layer's weights, if the
+                model was converted with the first layer split off (float32, or int8
+                with per-column scales from convert_model.py --quantize)
         """
         # Check if model file exists
         if not os.path.exists(model_path):
@@ -40,22 +362,56 @@ class JobRecommendationSystem:
         # Load the model
         try:
             print(f"Attempting to load model from {model_path}...")
-            self.model = load_model(model_path)
+            # Imported here so fallback mode and plain imports of this module don't pay for it
+            import onnxruntime as ort
+            self.session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+            self.input_name = self.session.get_inputs()[0].name
+            self.input_dim = self.session.get_inputs()[0].shape[1]
+            self.num_classes = self.session.get_outputs()[0].shape[1]
             print(f"Model loaded successfully from {model_path}")
         except Exception as e:
             print(f"Error loading model: {e}")
             print("\nPossible issues:")
-            print("1. The file is not a valid TensorFlow model")
-            print("2. The model was saved with a different TensorFlow version")
+            print("1. The file is not a valid ONNX model")
+            print("2. The Keras model has not been converted yet (run convert_model.py)")
             print("3. The file is corrupted")
-            print("\nTry recreating your model and saving it again.")
+            print("\nTry recreating your model and converting it again.")
             raise
 
+        # Load the first Dense layer so it can be applied directly to the sparse TF-IDF matrix
+        self.W0 = None
+        self.W0_scale = None
+        if first_layer_path and os.path.exists(first_layer_path):
+            try:
+                weights = np.load(first_layer_path)
+                if "W0_scale" in weights:
+                    # int8 weights stay int8 in memory; rows are dequantized as they are used
+                    self.W0 = weights["W0"]
+                    self.W0_scale = weights["W0_scale"].astype(np.float32)
+                else:
+                    self.W0 = weights["W0"].astype(np.float32)
+                self.b0 = weights["b0"].astype(np.float32)
+                self.first_activation = _ACTIVATIONS[str(weights["activation"])]
+                print(f"First layer weights loaded successfully from {first_layer_path}")
+            except Exception as e:
+                print(f"Error loading first layer weights: {e}")
+                raise
+            
+            # A stale .npz from another conversion would fail on every request, so fail here instead
+            if self.W0.shape[1] != self.input_dim:
+                raise ValueError(
+                    f"First layer weights in {first_layer_path} output {self.W0.shape[1]} features, "
+                    f"but the model at {model_path} expects {self.input_dim}. "
+                    "Re-run convert_model.py to regenerate both files."
+                )
+            self.input_dim = self.W0.shape[0]
+
         # Load the trained TF-IDF vectorizer
         try:
             with open(vectorizer_path, "rb") as f:
                 self.vectorizer = pickle.load(f)
             print("TF-IDF vectorizer loaded successfully.")
+            self._init_fast_tfidf()
         except Exception as e:
             print(f"Error loading vectorizer: {e}")
             raise
@@ -69,21 +425,41 @@ class JobRecommendationSystem:
             else:
                 # Create a default mapping if file doesn't exist
                 print(f"Job mapping file not found at {job_mapping_path}. Using default indices.")
-                self.job_titles = {str(i): f"Job Category {i+1}" for i in range(self.model.output_shape[1])}
+                self.job_titles = {str(i): f"Job Category {i+1}" for i in range(self.num_classes)}
         except Exception as e:
             print(f"Error loading job titles: {e}")
             # Fallback mapping
-            self.job_titles = {str(i): f"Job Category {i+1}" for i in range(self.model.output_shape[1])}
+            self.job_titles = {str(i): f"Job Category {i+1}" for i in range(self.num_classes)}
 
+        # Load environment variables (for API keys)
+        load_dotenv()
+        
         # Initialize API keys and endpoints
         self.gemini_api_key = os.environ.get("VITE_GEMINI_API_KEY")
         if not self.gemini_api_key:
             print("Warning: VITE_GEMINI_API_KEY not found in environment variables")
-        self.gemini_api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
+        # The model must support structured output (response_schema); override it without a code change
+        self.gemini_model = os.environ.get("VITE_GEMINI_MODEL", DEFAULT_GEMINI_MODEL)
+        self.gemini_api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model}:generateContent"
+
+        # Reuse HTTPS connections to Gemini instead of a new TCP/TLS handshake per request
+        self._http = requests.Session()
+        self._http.headers.update({
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.gemini_api_key or ""
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=COURSE_LOOKUP_WORKERS,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self._http.mount("https://", adapter)
+
+        # Cache predictions and Gemini responses by resume hash so identical resumes
+        # skip both the forward pass and the HTTP round-trip
+        self._prediction_cache = _LRUCache(CACHE_SIZE)
+        self._course_cache = _LRUCache(CACHE_SIZE)
 
     def extract_text_from_resume(self, file_path):
         """
-        Extract text from PDF or DOCX resume files.
+        Extract text from PDF, DOCX or TXT resume files.
         
         Args:
             file_path (str): Path to the resume file
@@ -94,23 +470,7 @@ class JobRecommendationSystem:
         Raises:
             ValueError: If the file format is not supported
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Resume file not found: {file_path}")
-            
-        if file_path.lower().endswith(".pdf"):
-            try:
-                with pdfplumber.open(file_path) as pdf:
-                    return "\n".join(page.extract_text() or "" for page in pdf.pages)
-            except Exception as e:
-                raise ValueError(f"Error extracting text from PDF: {e}")
-        elif file_path.lower().endswith(".docx"):
-            try:
-                doc = docx.Document(file_path)
-                return "\n".join(paragraph.text for paragraph in doc.paragraphs)
-            except Exception as e:
-                raise ValueError(f"Error extracting text from DOCX: {e}")
-        else:
-            raise ValueError("Unsupported file format. Only .pdf and .docx are supported.")
+        return extract_text(file_path)
 
     def preprocess_resume(self, resume_text):
         """
@@ -120,71 +480,278 @@ class JobRecommendationSystem:
             resume_text (str): Raw text extracted from the resume
             
         Returns:
-            numpy.ndarray: Feature vector for model prediction
+            scipy.sparse.csr_matrix: Sparse feature vector for model prediction
         """
         try:
-            features = self.vectorizer.transform([resume_text]).toarray()
-            return features
+            return self._vectorize([resume_text])
         except Exception as e:
             print(f"Error during preprocessing: {e}")
-            # Return zeros array matching the expected input shape
-            return np.zeros((1, self.model.input_shape[1]))
+            # Return an empty sparse row matching the expected input shape
+            return sp.csr_matrix((1, self.input_dim), dtype=np.float32)
+
+    def _vectorize(self, texts):
+        """
+        Transform resume texts into sparse TF-IDF features.
+        
+        Args:
+            texts (list): Resume texts
+            
+        Returns:
+            scipy.sparse.csr_matrix: Feature matrix with one row per text
+        """
+        if self._fast_tfidf:
+            return self._fast_transform(texts)
+        return self.vectorizer.transform(texts)
 
-    def get_top_job_recommendations(self, resume_text, top_n=3):
+    def _init_fast_tfidf(self):
+        """
+        Freeze the fitted vectorizer's vocabulary and idf for _fast_transform.
+        
+        Only plain unigram word TfidfVectorizers are specialized; anything else
+        (including CountVectorizer and subclasses) keeps using its own transform.
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        v = self.vectorizer
+        self._fast_tfidf = (
+            type(v) is TfidfVectorizer
+            and v.analyzer == "word"
+            and tuple(v.ngram_range) == (1, 1)
+            and v.input == "content"
+            and v.tokenizer is None and v.preprocessor is None and v.strip_accents is None
+            and v.norm in ("l2", None)
+            and hasattr(v, "vocabulary_")
+            and (not v.use_idf or hasattr(v, "idf_"))
+        )
+        if not self._fast_tfidf:
+            return
+        
+        self._vocab = v.vocabulary_
+        self._vocab_size = len(v.vocabulary_)
+        self._token_re = re.compile(v.token_pattern)
+        self._idf = v.idf_.astype(np.float32) if v.use_idf else None
+
+    def _fast_transform(self, texts):
+        """
+        TF-IDF transform equivalent to the fitted vectorizer, without sklearn's generic pipeline.
+        
+        Each text is tokenized once with the vectorizer's token pattern and terms are
+        counted by direct vocabulary lookup, then tf, idf and l2 normalization are
+        applied to the non-zero entries only.
+        
+        Args:
+            texts (list): Resume texts
+            
+        Returns:
+            scipy.sparse.csr_matrix: Feature matrix with one row per text
+        """
+        v = self.vectorizer
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            if v.lowercase:
+                text = text.lower()
+            row = {}
+            for token in self._token_re.findall(text):
+                i = self._vocab.get(token)
+                if i is not None:
+                    row[i] = row.get(i, 0) + 1
+            indices.extend(row.keys())
+            counts.extend(row.values())
+            indptr.append(len(indices))
+        
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float32)
+        if v.binary:
+            data[:] = 1
+        elif v.sublinear_tf:
+            data = 1 + np.log(data)
+        if self._idf is not None:
+            data *= self._idf[indices]
+        
+        features = sp.csr_matrix((data, indices, np.asarray(indptr)), shape=(len(texts), self._vocab_size))
+        if v.norm == "l2":
+            norms = np.sqrt(np.asarray(features.multiply(features).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            features.data /= np.repeat(norms, np.diff(features.indptr)).astype(np.float32)
+        return features
+
+    def _predict(self, features):
+        """
+        Run the model on sparse TF-IDF features.
+        
+        Args:
+            features (scipy.sparse.csr_matrix): Sparse feature matrix
+            
+        Returns:
+            numpy.ndarray: Model output probabilities
+        """
+        if self.W0_scale is not None:
+            # Gather and dequantize only the W0 rows for terms present in the batch;
+            # the scales are per column, so they can be applied after the product
+            rows, columns = np.unique(features.indices, return_inverse=True)
+            gathered = sp.csr_matrix((features.data, columns.reshape(-1), features.indptr),
+                                     shape=(features.shape[0], len(rows)))
+            product = np.asarray(gathered @ self.W0[rows].astype(np.float32))
+            hidden = self.first_activation(product * self.W0_scale + self.b0)
+        elif self.W0 is not None:
+            # Sparse x dense only touches the non-zero TF-IDF entries
+            hidden = self.first_activation(np.asarray(features @ self.W0) + self.b0)
+        else:
+            hidden = features.toarray()
+        return self.session.run(None, {self.input_name: hidden.astype(np.float32)})[0]
+
+    def get_top_job_recommendations(self, resume_text, top_n=3, resume_sha=None):
         """
         Get top job recommendations based on resume text.
         
         Args:
             resume_text (str): Preprocessed resume text
             top_n (int): Number of top recommendations to return
+            resume_sha (str): Hash of resume_text from _hash_resume; if given, results are cached
             
         Returns:
             list: List of dictionaries containing job titles and confidence scores
         """
-        features = self.preprocess_resume(resume_text)
+        key = (resume_sha, top_n)
+        if resume_sha is not None:
+            cached = self._prediction_cache.get(key)
+            if cached is not None:
+                return cached
         
+        # Failures are caught here, outside the cache, so they are never cached
         try:
-            predictions = self.model.predict(features)
-            # Ensure top_n doesn't exceed the number of job categories
-            top_n = min(top_n, len(self.job_titles))
-            # Get indices of top predictions
-            top_indices = np.argsort(predictions[0])[-top_n:][::-1]
+            predictions = self._predict(self.preprocess_resume(resume_text))
+            recommendations = self._recommendations_from_predictions(predictions, top_n)[0]
+        except Exception as e:
+            print(f"Error during prediction: {e}")
+            return [{"job_title": "Error in prediction", "confidence": 0.0}]
+        
+        if resume_sha is not None:
+            self._prediction_cache.put(key, recommendations)
+        return recommendations
+
+    def _recommendations_from_predictions(self, predictions, top_n):
+        """
+        Turn a batch of model outputs into job recommendations.
+        
+        Args:
+            predictions (numpy.ndarray): Model outputs of shape (n_resumes, n_classes)
+            top_n (int): Number of top recommendations per resume
             
-            return [
+        Returns:
+            list: One list of job title/confidence dictionaries per resume
+        """
+        # Ensure top_n doesn't exceed the number of job categories
+        top_n = min(top_n, len(self.job_titles))
+        top_indices = _top_k_indices(predictions, top_n)
+        top_scores = np.take_along_axis(predictions, top_indices, axis=1)
+        
+        return [
+            [
                 {
                     "job_title": self.job_titles.get(str(idx), f"Job Category {idx+1}"),
-                    "confidence": float(predictions[0][idx])
+                    "confidence": float(score)
                 }
-                for idx in top_indices
+                for idx, score in zip(row_indices.tolist(), row_scores.tolist())
             ]
-        except Exception as e:
-            print(f"Error during prediction: {e}")
-            return [{"job_title": "Error in prediction", "confidence": 0.0}]
+            for row_indices, row_scores in zip(top_indices, top_scores)
+        ]
 
-    def get_training_courses(self, job_title, resume_text):
+    def get_training_courses(self, job_title, resume_text, resume_sha=None):
         """
         Get recommended training courses for a specific job title using Gemini API.
         
         Args:
             job_title (str): The job title to get courses for
             resume_text (str): Resume text to provide context
+            resume_sha (str): Hash of resume_text from _hash_resume, if already computed
             
         Returns:
             list: List of recommended courses
         """
+        return self.get_training_courses_for_jobs([job_title], resume_text, resume_sha)[job_title]
+
+    def get_training_courses_for_jobs(self, job_titles, resume_text, resume_sha=None):
+        """
+        Get recommended training courses for several job titles with a single Gemini API call.
+        
+        Args:
+            job_titles (list): The job titles to get courses for
+            resume_text (str): Resume text to provide context
+            resume_sha (str): Hash of resume_text from _hash_resume, if already computed
+            
+        Returns:
+            dict: Mapping of job title to its list of recommended courses
+        """
         if not self.gemini_api_key:
-            return [{"course_name": "API Key Missing", 
-                    "provider": "N/A", 
-                    "description": "No Gemini API key provided in environment variables.",
-                    "url": "",
-                    "relevance": "Please set the VITE_GEMINI_API_KEY environment variable."}]
+            return {job_title: [{"course_name": "API Key Missing", 
+                                 "provider": "N/A", 
+                                 "description": "No Gemini API key provided in environment variables.",
+                                 "url": "",
+                                 "relevance": "Please set the VITE_GEMINI_API_KEY environment variable."}]
+                    for job_title in job_titles}
+        
+        if resume_sha is None:
+            resume_sha = _hash_resume(resume_text)
         
+        key = (tuple(job_titles), resume_sha)
+        cached = self._course_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Errors are raised rather than returned so they are never cached
+        try:
+            courses = self._fetch_training_courses(list(job_titles), resume_text)
+            self._course_cache.put(key, courses)
+            return courses
+        except requests.exceptions.Timeout:
+            # Gemini is too slow right now; answer with generic courses instead of blocking
+            return {job_title: _default_courses(job_title) for job_title in job_titles}
+        except GeminiAPIError as e:
+            error = {
+                "course_name": "API Error", 
+                "provider": "N/A", 
+                "description": str(e),
+                "url": "",
+                "relevance": "Please check your API key and network connection."
+            }
+        except Exception as e:
+            error = {
+                "course_name": "Exception", 
+                "provider": "N/A", 
+                "description": f"Exception when calling Gemini API: {str(e)}",
+                "url": "",
+                "relevance": "Please check your network connection."
+            }
+        return {job_title: [error] for job_title in job_titles}
+
+    def _fetch_training_courses(self, job_titles, resume_text):
+        """
+        Call the Gemini API once for training courses for all given job titles.
+        
+        Args:
+            job_titles (list): The job titles to get courses for
+            resume_text (str): Resume text to provide context
+            
+        Returns:
+            dict: Mapping of job title to its list of recommended courses
+            
+        Raises:
+            GeminiAPIError: If the API returns a non-200 response or omits a job title
+            requests.exceptions.Timeout: If the API does not respond in time after one retry
+        """
+        jobs = "\n".join(f"- {job_title}" for job_title in job_titles)
         prompt = f"""
         Based on this resume: 
         
         {resume_text}
         
-        I need 3 specific training courses available online that would help this person qualify for a {job_title} position.
+        For each of these job titles, I need 3 specific training courses available online
+        that would help this person qualify for that position:
+        
+        {jobs}
         
         For each course, provide:
         1. Course name
@@ -193,121 +760,54 @@ class JobRecommendationSystem:
         4. URL if available
         5. Why it's relevant for this specific job
         
-        Format as a JSON list with course name, provider, description, url, and relevance fields.
+        Return one entry per job title, using the job title exactly as written above.
         """
         
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self.gemini_api_key
-        }
-        
+        # Ask for schema-constrained JSON so the response can be parsed directly
         data = {
-            "contents": [{"parts": [{"text": prompt}]}]
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "response_mime_type": "application/json",
+                "response_schema": _JOB_COURSES_SCHEMA
+            }
         }
         
         try:
-            response = requests.post(self.gemini_api_url, headers=headers, json=data)
-            if response.status_code == 200:
-                response_data = response.json()
-                text_response = response_data["candidates"][0]["content"]["parts"][0]["text"]
-                try:
-                    # Try to extract JSON from the response
-                    json_start = text_response.find('[')
-                    json_end = text_response.rfind(']') + 1
-                    if json_start >= 0 and json_end > 0:
-                        json_content = text_response[json_start:json_end]
-                        return json.loads(json_content)
-                    else:
-                        return self._extract_courses_from_text(text_response)
-                except json.JSONDecodeError:
-                    return self._extract_courses_from_text(text_response)
-            else:
-                error_msg = f"Error calling Gemini API: {response.status_code}"
-                try:
-                    error_detail = response.json().get("error", {}).get("message", "Unknown error")
-                    error_msg += f" - {error_detail}"
-                except:
-                    error_msg += f" - {response.text[:100]}"
-                    
-                return [{
-                    "course_name": "API Error", 
-                    "provider": "N/A", 
-                    "description": error_msg,
-                    "url": "",
-                    "relevance": "Please check your API key and network connection."
-                }]
-        except Exception as e:
-            return [{
-                "course_name": "Exception", 
-                "provider": "N/A", 
-                "description": f"Exception when calling Gemini API: {str(e)}",
-                "url": "",
-                "relevance": "Please check your network connection."
-            }]
-
-    def _extract_courses_from_text(self, text):
-        """
-        Extract course information from non-JSON formatted text.
+            response = self._http.post(self.gemini_api_url, json=data, timeout=GEMINI_TIMEOUT)
+        except requests.exceptions.ReadTimeout:
+            # Retry once with a tighter read budget so a slow response can't stall the request
+            response = self._http.post(self.gemini_api_url, json=data, timeout=GEMINI_RETRY_TIMEOUT)
+        if response.status_code != 200:
+            error_msg = f"Error calling Gemini API: {response.status_code}"
+            try:
+                error_detail = response.json().get("error", {}).get("message", "Unknown error")
+                error_msg += f" - {error_detail}"
+            except:
+                error_msg += f" - {response.text[:100]}"
+            raise GeminiAPIError(error_msg)
         
-        Args:
-            text (str): Text response from Gemini API
-            
-        Returns:
-            list: List of course dictionaries
-        """
-        courses = []
-        sections = []
-        current_section = ""
-        lines = text.split('\n')
-        
-        # Split text into course sections
-        for line in lines:
-            if line.strip().startswith(('1.', '2.', '3.', 'Course 1:', 'Course 2:', 'Course 3:')):
-                if current_section:
-                    sections.append(current_section)
-                current_section = line
-            elif current_section:
-                current_section += "\n" + line
-        
-        if current_section:
-            sections.append(current_section)
-        
-        # Extract course information from each section
-        for section in sections:
-            course = {
-                "course_name": "Unknown Course",
-                "provider": "Unknown Provider",
-                "description": section,
-                "url": "",
-                "relevance": ""
-            }
-            
-            for line in section.split('\n'):
-                line = line.strip()
-                if "course" in line.lower() or "name" in line.lower():
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        course["course_name"] = parts[1].strip()
-                elif "provider" in line.lower():
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        course["provider"] = parts[1].strip()
-                elif "description" in line.lower():
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        course["description"] = parts[1].strip()
-                elif "url" in line.lower() or "http" in line.lower():
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        course["url"] = parts[1].strip()
-                elif "relevan" in line.lower():
-                    parts = line.split(':', 1)
-                    if len(parts) > 1:
-                        course["relevance"] = parts[1].strip()
-            
-            courses.append(course)
+        response_data = response.json()
+        text_response = response_data["candidates"][0]["content"]["parts"][0]["text"]
+        entries = json.loads(text_response)
         
-        return courses[:3]  # Return at most 3 courses
+        # Gemini may echo titles with different casing or spacing, so match on a normalized form
+        courses_by_job = {_normalize_title(entry["job_title"]): entry["courses"] for entry in entries}
+        courses = {
+            job_title: courses_by_job[_normalize_title(job_title)]
+            for job_title in job_titles
+            if _normalize_title(job_title) in courses_by_job
+        }
+        
+        # If no title matched at all but there is one entry per job, assume Gemini kept the
+        # order; with some titles matched, position can't be trusted to line up
+        if not courses and len(entries) == len(job_titles):
+            courses = {job_title: entry["courses"] for job_title, entry in zip(job_titles, entries)}
+        
+        # Raise rather than return partial results so they are never cached
+        missing = [job_title for job_title in job_titles if job_title not in courses]
+        if missing:
+            raise GeminiAPIError(f"Gemini response has no courses for: {', '.join(missing)}")
+        return courses
 
     def process_resume_file(self, file_path):
         """
@@ -321,22 +821,120 @@ class JobRecommendationSystem:
         """
         try:
             resume_text = self.extract_text_from_resume(file_path)
-            job_recommendations = self.get_top_job_recommendations(resume_text)
-            
-            results = []
-            for job in job_recommendations:
-                job_title = job["job_title"]
-                courses = self.get_training_courses(job_title, resume_text)
-                results.append({
-                    "job_title": job_title,
-                    "confidence": job["confidence"],
-                    "training_courses": courses
-                })
+            resume_sha = _hash_resume(resume_text)
+            job_recommendations = self.get_top_job_recommendations(resume_text, resume_sha=resume_sha)
             
+            results = self._attach_training_courses([(job_recommendations, resume_text, resume_sha)])[0]
             return {"recommendations": results}
         except Exception as e:
             return {"error": str(e)}
 
+    def process_resume_files(self, file_paths, top_n=3):
+        """
+        Process several resume files with a single batched model prediction.
+        
+        Args:
+            file_paths (list): Paths to the resume files
+            top_n (int): Number of top recommendations per resume
+            
+        Returns:
+            list: One result dictionary per file, in the same order as file_paths
+        """
+        results = [None] * len(file_paths)
+        
+        # PDF/DOCX extraction is mostly I/O, so read the files concurrently
+        def extract(file_path):
+            try:
+                return self.extract_text_from_resume(file_path), None
+            except Exception as e:
+                return None, e
+        
+        with ThreadPoolExecutor() as executor:
+            extracted = list(executor.map(extract, file_paths))
+        
+        batch = []
+        for i, (resume_text, error) in enumerate(extracted):
+            if error is not None:
+                results[i] = {"error": str(error)}
+            else:
+                batch.append(i)
+        if not batch:
+            return results
+        
+        try:
+            texts = [extracted[i][0] for i in batch]
+            predictions = self._predict(self._vectorize(texts))
+            job_recommendations = self._recommendations_from_predictions(predictions, top_n)
+            shas = [_hash_resume(text) for text in texts]
+            for resume_sha, jobs in zip(shas, job_recommendations):
+                self._prediction_cache.put((resume_sha, top_n), jobs)
+            course_results = self._attach_training_courses(list(zip(job_recommendations, texts, shas)))
+            for i, recommendations in zip(batch, course_results):
+                results[i] = {"recommendations": recommendations}
+        except Exception as e:
+            for i in batch:
+                results[i] = {"error": str(e)}
+        
+        return results
+
+    def _attach_training_courses(self, items):
+        """
+        Look up training courses for every recommended job.
+        
+        Args:
+            items (list): (job_recommendations, resume_text, resume_sha) tuples
+            
+        Returns:
+            list: One list of recommendation dictionaries with training courses per item
+        """
+        # One Gemini call per resume covers all of its jobs; run the calls for different
+        # resumes concurrently since they are I/O-bound
+        workers = max(1, min(COURSE_LOOKUP_WORKERS, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            courses_by_job = list(executor.map(
+                lambda item: self.get_training_courses_for_jobs(
+                    [job["job_title"] for job in item[0]], item[1], item[2]
+                ),
+                items
+            ))
+        
+        return [
+            [
+                {
+                    "job_title": job["job_title"],
+                    "confidence": job["confidence"],
+                    "training_courses": courses[job["job_title"]]
+                }
+                for job in job_recommendations
+            ]
+            for (job_recommendations, _, _), courses in zip(items, courses_by_job)
+        ]
+
+
+# Process-wide instance shared by all requests, see get_system()
+_SYSTEM = None
+_SYSTEM_LOCK = threading.Lock()
+
+def get_system():
+    """
+    Get the shared JobRecommendationSystem, creating it on first use.
+    
+    Loading the model, vectorizer and job titles is expensive, so a web server
+    should call this at startup (or on first request) and reuse the instance.
+    The instance is safe to share between threads: its attributes are only
+    assigned in __init__, the prediction and course caches are locked, and
+    pypdfium2 calls are serialized.
+    
+    Returns:
+        JobRecommendationSystem: The process-wide recommendation system
+    """
+    global _SYSTEM
+    if _SYSTEM is None:
+        with _SYSTEM_LOCK:
+            if _SYSTEM is None:
+                _SYSTEM = JobRecommendationSystem()
+    return _SYSTEM
+
 
 # Example usage
 if __name__ == "__main__":
@@ -356,7 +954,7 @@ if __name__ == "__main__":
     
     print("\n=== Job Recommendation System ===")
     print("This script requires three files to run properly:")
-    print("1. A TensorFlow model file (.h5)")
+    print("1. An ONNX model file (.onnx, converted from the .h5 with convert_model.py)")
     print("2. A trained TF-IDF vectorizer (.pkl)")
     print("3. A resume file to analyze (.pdf or .docx)")
     print("\nIf you're getting errors, try the fallback mode which bypasses model loading.")
@@ -441,67 +1039,81 @@ SKILLS
         # Create a minimal system that doesn't use the actual model
         class FallbackSystem:
             def extract_text_from_resume(self, file_path):
-                if file_path.lower().endswith(".pdf"):
-                    try:
-                        with pdfplumber.open(file_path) as pdf:
-                            return "\n".join(page.extract_text() or "" for page in pdf.pages)
-                    except Exception as e:
-                        return f"Error extracting text: {e}"
-                elif file_path.lower().endswith(".docx"):
-                    try:
-                        doc = docx.Document(file_path)
-                        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
-                    except Exception as e:
-                        return f"Error extracting text: {e}"
-                elif file_path.lower().endswith(".txt"):
-                    try:
-                        with open(file_path, 'r') as f:
-                            return f.read()
-                    except Exception as e:
-                        return f"Error reading text file: {e}"
-                else:
-                    return "Unsupported file format. Only .pdf, .docx, and .txt are supported."
+                try:
+                    return extract_text(file_path)
+                except Exception as e:
+                    return f"Error extracting text: {e}"
+            
+            # Basic keyword analysis for fallback job matching
+            KEYWORDS = {
+                "Data Scientist": ["data science", "machine learning", "python", "statistics", "analytics", "data analysis", "pandas", "numpy", "sklearn"],
+                "Software Engineer": ["software", "programming", "development", "java", "python", "javascript", "code", "algorithm", "api"],
+                "Product Manager": ["product", "management", "strategy", "roadmap", "agile", "scrum", "user experience", "prioritization"],
+                "UX Designer": ["design", "user experience", "ux", "ui", "wireframe", "prototype", "usability", "sketch", "figma"],
+                "DevOps Engineer": ["devops", "ci/cd", "pipeline", "aws", "cloud", "docker", "kubernetes", "infrastructure"]
+            }
+            
+            def __init__(self):
+                # One regex over all terms scans the lowercased resume once. The lookahead reports
+                # the longest term starting at every position, so terms that overlap each other
+                # (e.g. "api" and "pipeline" in "apipeline") are all found
+                self.jobs = list(self.KEYWORDS)
+                terms = list(dict.fromkeys(term.lower() for terms in self.KEYWORDS.values() for term in terms))
+                self.term_index = {term: i for i, term in enumerate(terms)}
+                self.terms_re = re.compile(
+                    "(?=(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + "))"
+                )
+                
+                # Some terms (e.g. "python") belong to several jobs, so map terms to jobs with a 0/1 matrix
+                term_jobs = np.zeros((len(terms), len(self.jobs)), dtype=np.int64)
+                for j, job in enumerate(self.jobs):
+                    for term in self.KEYWORDS[job]:
+                        term_jobs[self.term_index[term.lower()], j] = 1
+                
+                # Terms that can overlap themselves (e.g. "statistics") would be counted more often
+                # than str.count counts them, so those are counted with str.count directly
+                self.self_overlapping = [
+                    term for term in terms
+                    if any(term[:k] == term[-k:] for k in range(1, len(term)))
+                ]
+                
+                # Only the longest term at each position is reported, but every term is counted on
+                # its own (e.g. "javascript" also counts as "java"), so each hit also credits the
+                # terms it starts with
+                prefixes = np.array([
+                    [int(hit.startswith(term) and term not in self.self_overlapping) for term in terms]
+                    for hit in terms
+                ], dtype=np.int64)
+                self.hit_jobs = prefixes @ term_jobs
+                self.term_jobs = term_jobs
             
             def process_resume_file(self, file_path):
                 resume_text = self.extract_text_from_resume(file_path)
                 
-                # Basic keyword analysis for fallback job matching
-                keywords = {
-                    "Data Scientist": ["data science", "machine learning", "python", "statistics", "analytics", "data analysis", "pandas", "numpy", "sklearn"],
-                    "Software Engineer": ["software", "programming", "development", "java", "python", "javascript", "code", "algorithm", "api"],
-                    "Product Manager": ["product", "management", "strategy", "roadmap", "agile", "scrum", "user experience", "prioritization"],
-                    "UX Designer": ["design", "user experience", "ux", "ui", "wireframe", "prototype", "usability", "sketch", "figma"],
-                    "DevOps Engineer": ["devops", "ci/cd", "pipeline", "aws", "cloud", "docker", "kubernetes", "infrastructure"]
-                }
-                
                 # Count keyword matches for each job
-                job_scores = {}
                 resume_text_lower = resume_text.lower()
-                for job, terms in keywords.items():
-                    score = sum(resume_text_lower.count(term.lower()) for term in terms)
-                    job_scores[job] = score
+                hits = self.terms_re.findall(resume_text_lower)
+                ids = np.fromiter((self.term_index[hit] for hit in hits), dtype=np.int64, count=len(hits))
+                job_scores = np.bincount(ids, minlength=len(self.term_index)) @ self.hit_jobs
+                for term in self.self_overlapping:
+                    job_scores += resume_text_lower.count(term) * self.term_jobs[self.term_index[term]]
+                
+                # Normalize scores to a confidence between 0.5 and 0.95
+                confidences = np.clip(0.5 + job_scores / 10, 0.5, 0.95)
                 
-                # Sort by score
-                sorted_jobs = sorted(job_scores.items(), key=lambda x: x[1], reverse=True)
+                # Sort by score, keeping keyword table order for ties
+                sorted_jobs = [
+                    (self.jobs[j], confidences[j])
+                    for j in np.argsort(-job_scores, kind="stable")
+                ]
                 
                 # Create recommendations
                 recommendations = []
-                for job, score in sorted_jobs[:3]:  # Top 3 jobs
-                    # Normalize score to a confidence between 0.5 and 0.95
-                    confidence = min(0.95, max(0.5, 0.5 + (score / 10)))
-                    
+                for job, confidence in sorted_jobs[:3]:  # Top 3 jobs
                     recommendations.append({
                         "job_title": job,
-                        "confidence": round(confidence, 2),
-                        "training_courses": [
-                            {
-                                "course_name": f"{job} Fundamentals",
-                                "provider": "Coursera",
-                                "description": f"Comprehensive training for {job} roles",
-                                "url": "https://www.coursera.org",
-                                "relevance": "Core professional skills"
-                            }
-                        ]
+                        "confidence": round(float(confidence), 2),
+                        "training_courses": _default_courses(job)
                     })
                 
                 return {
@@ -521,7 +1133,7 @@ SKILLS
             print(f"Error in fallback mode: {e}")
     else:
         # Set the correct paths for your files
-        model_path = input("Enter the path to your model file (e.g., ./your_model.h5): ./model3.h5")
+        model_path = input("Enter the path to your model file (e.g., ./your_model.onnx): ./model.onnx")
         vectorizer_path = input("Enter the path to your vectorizer file (e.g., ./vectorizer.pkl): ./vectorizer.py")
         resume_file_path = input("Enter the path to the resume file to analyze: ./10553553.pdf")
         